@@ -1,16 +1,20 @@
 import os
 import logging
-import requests
+import aiohttp
 import asyncio
 import threading
+import time
 import numpy as np
-import tensorflow as tf
 import joblib
-from functools import wraps
+import base58
+from numba import njit
+from cachetools import TTLCache
+from functools import lru_cache, wraps
 from datetime import datetime
 from telegram import Bot
 from telegram.ext import Updater, CommandHandler
 from solana.rpc.api import Client
+from solana.keypair import Keypair
 from solana.publickey import PublicKey
 from solana.transaction import Transaction
 from solana.system_program import TransferParams, transfer
@@ -18,7 +22,13 @@ from solana.rpc.types import TxOpts
 from solana.rpc.commitment import Confirmed
 from solana.rpc.async_api import AsyncClient
 from solana.rpc.core import RPCException
-from sklearn.preprocessing import MinMaxScaler
+
+# The standalone TFLite runtime avoids importing all of TensorFlow
+try:
+    from tflite_runtime.interpreter import Interpreter
+except ImportError:
+    import tensorflow as tf
+    Interpreter = tf.lite.Interpreter
 
 # -------------------- Configuration --------------------
 logging.basicConfig(
@@ -36,8 +46,12 @@ SOLANA_RPC_URL = os.environ.get("SOLANA_RPC_URL", "https://api.mainnet-beta.sola
 # Trading parameters
 WHALE_THRESHOLD = 100000  # $100,000
 ARBITRAGE_THRESHOLD = 0.05  # 5% price difference
+ARBITRAGE_TOKENS = ["SOL"]  # Tokens scanned across Raydium and Orca
 SPREAD_TARGET = 0.02  # 2% spread for market making
 REBALANCE_INTERVAL = 3600  # 1 hour
+RATE_LIMIT = 5  # Max 5 commands per minute
+BLOCKHASH_TTL = 20  # Seconds a prefetched blockhash stays usable; they are valid for ~60s
+SLOT_TIME = 0.4  # Seconds per Solana slot, after which a new blockhash is available
 
 # Initialize components
 solana_client = Client(SOLANA_RPC_URL)
@@ -45,38 +59,170 @@ async_solana_client = AsyncClient(SOLANA_RPC_URL)
 updater = Updater(token=TOKEN, use_context=True)
 dispatcher = updater.dispatcher
 
+# Shared HTTP session, created lazily so it binds to the running event loop
+http_session = None
+
+async def get_http_session():
+    global http_session
+    if http_session is None or http_session.closed:
+        connector = aiohttp.TCPConnector(limit=20, ttl_dns_cache=300)
+        http_session = aiohttp.ClientSession(connector=connector)
+    return http_session
+
+# Parse the signing key once, on first use, so a bad key fails trades rather than startup
+@lru_cache(maxsize=1)
+def get_keypair():
+    try:
+        return Keypair.from_secret_key(base58.b58decode(PRIVATE_KEY))
+    except ValueError as e:
+        raise ValueError(f"PRIVATE_KEY is not a base58-encoded Solana secret key: {e}") from e
+
+# Each trade signs with a blockhash no earlier trade used, so identical trades never
+# serialize to the same (duplicate) transaction. The next one is prefetched off the hot path.
+blockhash_cache = TTLCache(maxsize=1, ttl=BLOCKHASH_TTL)
+used_blockhashes = TTLCache(maxsize=1000, ttl=120)
+blockhash_prefetch = None
+
+async def fetch_unused_blockhash():
+    while True:
+        response = await async_solana_client.get_latest_blockhash()
+        blockhash = str(response.value.blockhash)
+        if blockhash not in used_blockhashes:
+            return blockhash
+        await asyncio.sleep(SLOT_TIME)
+
+async def prefetch_blockhash():
+    try:
+        await asyncio.sleep(SLOT_TIME)
+        blockhash_cache["latest"] = await fetch_unused_blockhash()
+    except Exception as e:
+        logger.error(f"Blockhash prefetch error: {e}")
+
+async def get_recent_blockhash():
+    global blockhash_prefetch
+    blockhash = blockhash_cache.pop("latest", None)
+    if blockhash is None or blockhash in used_blockhashes:
+        blockhash = await fetch_unused_blockhash()
+    used_blockhashes[blockhash] = True
+    if blockhash_prefetch is None or blockhash_prefetch.done():
+        blockhash_prefetch = asyncio.ensure_future(prefetch_blockhash())
+    return blockhash
+
+# Per-user command counts, keyed by (user_id, minute) so each window resets
+user_command_count = TTLCache(maxsize=10000, ttl=60)
+user_command_lock = threading.Lock()
+
+def rate_limit(func):
+    @wraps(func)
+    def wrapped(self, update, context):
+        key = (update.message.from_user.id, int(time.time() // 60))
+        with user_command_lock:
+            count = user_command_count.get(key, 0)
+            if count < RATE_LIMIT:
+                user_command_count[key] = count + 1
+        
+        if count >= RATE_LIMIT:
+            update.message.reply_text("🚫 Rate limit exceeded.")
+            return
+        return func(self, update, context)
+    return wrapped
+
+# -------------------- Strategy Math --------------------
+@njit(cache=True)
+def find_arb_pairs(p1, p2, thr):
+    # Indices where the relative spread between the two price vectors exceeds thr;
+    # missing (NaN) or non-positive prices never match
+    out = np.empty(len(p1), np.int32)
+    k = 0
+    for i in range(len(p1)):
+        lo = p1[i] if p1[i] < p2[i] else p2[i]
+        if lo > 0 and abs(p1[i] - p2[i]) / lo > thr:
+            out[k] = i
+            k += 1
+    return out[:k]
+
 # -------------------- AI/ML Models --------------------
+# Models are immutable, so load each one once per process
+@lru_cache(maxsize=1)
+def _get_price_interpreter():
+    interpreter = Interpreter(model_path="models/price_predictor.tflite")
+    interpreter.allocate_tensors()
+    return interpreter
+
+@lru_cache(maxsize=1)
+def _get_price_scaler():
+    with np.load("models/price_scaler.npz") as z:
+        return {key: z[key] for key in z.files}
+
+@lru_cache(maxsize=1)
+def _get_scam_detector():
+    return joblib.load("models/scam_detector_model.pkl")
+
 class PricePredictor:
     def __init__(self):
-        self.model = tf.keras.models.load_model("models/price_predictor_model.h5")
-        self.scaler = joblib.load("models/price_scaler.pkl")
+        self.interpreter = _get_price_interpreter()
+        self._input_index = self.interpreter.get_input_details()[0]["index"]
+        self._output_index = self.interpreter.get_output_details()[0]["index"]
         self.history_length = 50
+        # The price scaler is a single-feature min-max affine map; apply it directly
+        scaler = _get_price_scaler()
+        range_min, range_max = scaler["rmin"], scaler["rmax"]
+        data_min = scaler["min"][0]
+        self._scale = np.float32((range_max - range_min) / (scaler["max"][0] - data_min))
+        self._offset = np.float32(data_min)
+        self._range_min = np.float32(range_min)
+        # token_symbol -> (minute_bucket, predicted_price)
+        self._prediction_cache = {}
 
-    def fetch_historical_data(self, token_symbol):
+    async def fetch_historical_data(self, token_symbol):
         url = f"https://api.coingecko.com/api/v3/coins/{token_symbol}/market_chart?vs_currency=usd&days=30"
         try:
-            response = requests.get(url)
-            response.raise_for_status()
-            data = response.json()
+            session = await get_http_session()
+            async with session.get(url) as response:
+                response.raise_for_status()
+                data = await response.json()
             return [entry[1] for entry in data["prices"]][-self.history_length:]
         except Exception as e:
             logger.error(f"Price data error: {e}")
             return None
 
-    def predict_price(self, token_symbol):
-        historical_data = self.fetch_historical_data(token_symbol)
-        if not historical_data:
-            return None
-            
-        scaled_data = self.scaler.transform(np.array(historical_data).reshape(-1, 1))
-        input_data = scaled_data.reshape(1, -1, 1)
-        predicted_price = self.model.predict(input_data)[0][0]
-        return self.scaler.inverse_transform([[predicted_price]])[0][0]
+    async def predict_prices(self, token_symbols):
+        minute_bucket = int(time.time() // 60)
+        predictions = {}
+        pending = []
+        for token_symbol in token_symbols:
+            cached = self._prediction_cache.get(token_symbol)
+            if cached and cached[0] == minute_bucket:
+                predictions[token_symbol] = cached[1]
+            else:
+                pending.append(token_symbol)
+
+        histories = await asyncio.gather(*[self.fetch_historical_data(t) for t in pending])
+        # The model only accepts full-length windows
+        ready = [(t, h) for t, h in zip(pending, histories) if h and len(h) >= self.history_length]
+        if ready:
+            prices = np.asarray([h for _, h in ready], dtype=np.float32)
+            input_data = ((prices - self._offset) * self._scale + self._range_min).reshape(len(ready), -1, 1)
+            # The fused-LSTM model has a fixed batch of 1 and cannot be resized
+            predicted = np.empty(len(ready), dtype=np.float32)
+            for i in range(len(ready)):
+                self.interpreter.set_tensor(self._input_index, input_data[i:i + 1])
+                self.interpreter.invoke()
+                predicted[i] = self.interpreter.get_tensor(self._output_index)[0][0]
+            for (token_symbol, _), scaled_price in zip(ready, predicted):
+                price = float((scaled_price - self._range_min) / self._scale + self._offset)
+                self._prediction_cache[token_symbol] = (minute_bucket, price)
+                predictions[token_symbol] = price
+
+        return [predictions.get(t) for t in token_symbols]
+
+    async def predict_price(self, token_symbol):
+        return (await self.predict_prices([token_symbol]))[0]
 
 class AdvancedTrader:
     def __init__(self):
         self.price_predictor = PricePredictor()
-        self.scam_detector = joblib.load("models/scam_detector_model.pkl")
+        self.scam_detector = _get_scam_detector()
         self.portfolio = {}
         self.open_orders = {}
         self.transaction_history = []
@@ -89,25 +235,56 @@ class AdvancedTrader:
                 from_pubkey=PublicKey(WALLET_ADDRESS),
                 to_pubkey=PublicKey(token_address),
                 lamports=int(amount * 1e9)
-            ))
-            signed_tx = solana_client.send_transaction(tx, PRIVATE_KEY)
+            )))
+            signed_tx = await async_solana_client.send_transaction(
+                tx, get_keypair(), recent_blockhash=await get_recent_blockhash()
+            )
             return signed_tx.value
         except RPCException as e:
             logger.error(f"Trade error: {e}")
             return None
 
+    async def execute_batch_trade(self, trades):
+        # One transaction with a transfer per (token_address, amount, order_type) buy leg;
+        # like execute_trade, only an outbound transfer is available, so sells are skipped
+        buys = []
+        for token_address, amount, order_type in trades:
+            if order_type == "buy":
+                buys.append((token_address, amount))
+            else:
+                logger.warning(f"Skipping {order_type} leg for {token_address}: no transfer instruction for it")
+        if not buys:
+            return None
+
+        try:
+            tx = Transaction()
+            for token_address, amount in buys:
+                tx.add(transfer(TransferParams(
+                    from_pubkey=PublicKey(WALLET_ADDRESS),
+                    to_pubkey=PublicKey(token_address),
+                    lamports=int(amount * 1e9)
+                )))
+            signed_tx = await async_solana_client.send_transaction(
+                tx, get_keypair(), recent_blockhash=await get_recent_blockhash()
+            )
+            return signed_tx.value
+        except RPCException as e:
+            logger.error(f"Batch trade error: {e}")
+            return None
+
     # -------------------- Advanced Strategies --------------------
     async def arbitrage_opportunity(self):
         while self.trading_enabled:
             try:
-                dex1_price = self.get_dex_price("raydium", "SOL")
-                dex2_price = self.get_dex_price("orca", "SOL")
+                dex1_prices = np.array([self.get_dex_price("raydium", t) for t in ARBITRAGE_TOKENS], dtype=np.float64)
+                dex2_prices = np.array([self.get_dex_price("orca", t) for t in ARBITRAGE_TOKENS], dtype=np.float64)
                 
-                if abs(dex1_price - dex2_price) / min(dex1_price, dex2_price) > ARBITRAGE_THRESHOLD:
-                    if dex1_price > dex2_price:
-                        await self.execute_arbitrage("orca", "raydium", "SOL")
+                for i in find_arb_pairs(dex1_prices, dex2_prices, ARBITRAGE_THRESHOLD):
+                    token = ARBITRAGE_TOKENS[i]
+                    if dex1_prices[i] > dex2_prices[i]:
+                        await self.execute_arbitrage("orca", "raydium", token)
                     else:
-                        await self.execute_arbitrage("raydium", "orca", "SOL")
+                        await self.execute_arbitrage("raydium", "orca", token)
                 await asyncio.sleep(10)
             except Exception as e:
                 logger.error(f"Arbitrage error: {e}")
@@ -141,32 +318,22 @@ class AdvancedTrader:
                     "OTHER": 0.1
                 }
                 
-                for token, target in target_allocation.items():
-                    current_allocation = self.portfolio.get(token, 0) / total_value
-                    if current_allocation < target:
-                        await self.execute_trade(token, (target - current_allocation) * total_value, "buy")
-                    elif current_allocation > target:
-                        await self.execute_trade(token, (current_allocation - target) * total_value, "sell")
+                tokens = list(target_allocation)
+                target_vec = np.array([target_allocation[t] for t in tokens])
+                current = np.array([self.portfolio.get(t, 0) for t in tokens], dtype=np.float64)
+                delta = target_vec * total_value - current
+                
+                # Positive deltas are buys, negative deltas sells; ignore sub-lamport residue
+                legs = np.flatnonzero(np.abs(delta) * 1e9 >= 1)
+                trades = [(tokens[i], abs(delta[i]), "buy" if delta[i] > 0 else "sell") for i in legs]
+                if trades:
+                    await self.execute_batch_trade(trades)
                 await asyncio.sleep(REBALANCE_INTERVAL)
             except Exception as e:
                 logger.error(f"Rebalance error: {e}")
                 await asyncio.sleep(REBALANCE_INTERVAL)
 
     # -------------------- Telegram Commands --------------------
-    @staticmethod
-    def rate_limit(func):
-        @wraps(func)
-        def wrapped(update, context):
-            user_id = update.message.from_user.id
-            context.bot_data.setdefault('user_command_count', {})
-            context.bot_data['user_command_count'][user_id] = context.bot_data['user_command_count'].get(user_id, 0) + 1
-            
-            if context.bot_data['user_command_count'][user_id] > 5:
-                update.message.reply_text("🚫 Rate limit exceeded.")
-                return
-            return func(update, context)
-        return wrapped
-
     @rate_limit
     def handle_trade(self, update, context):
         # Existing trade logic with AI integration
@@ -176,10 +343,10 @@ class AdvancedTrader:
 
 # -------------------- Main Execution --------------------
 if __name__ == "__main__":
-<<<<<<< HEAD
     trader = AdvancedTrader()
     
-    # Start strategy threads
+    # Run all strategies on one event loop in a single background thread
+    loop = asyncio.new_event_loop()
     strategies = [
         trader.arbitrage_opportunity,
         trader.market_making,
@@ -187,13 +354,12 @@ if __name__ == "__main__":
     ]
     
     for strategy in strategies:
-        thread = threading.Thread(target=asyncio.run, args=(strategy(),))
-        thread.daemon = True
-        thread.start()
+        loop.create_task(strategy())
+
+    strategy_thread = threading.Thread(target=loop.run_forever)
+    strategy_thread.daemon = True
+    strategy_thread.start()
 
     # Start Telegram bot
     updater.start_polling()
     updater.idle()
-=======
-    start_bot()
->>>>>>> 94e3da086bc773fec8b536575cada1b762eaa059
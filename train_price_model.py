@@ -3,7 +3,10 @@ import pandas as pd
 import tensorflow as tf
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import MinMaxScaler
-import joblib
+
+# Mixed precision only pays off on GPUs; it slows down CPU training
+if tf.config.list_physical_devices("GPU"):
+    tf.keras.mixed_precision.set_global_policy("mixed_float16")
 
 # Load historical Solana price data
 # Data format: CSV with columns ["timestamp", "price"]
@@ -16,11 +19,10 @@ scaled_prices = scaler.fit_transform(prices.reshape(-1, 1))
 
 # Create sequences for LSTM
 def create_sequences(data, seq_length):
-    X, y = [], []
-    for i in range(len(data) - seq_length):
-        X.append(data[i:i + seq_length])
-        y.append(data[i + seq_length])
-    return np.array(X), np.array(y)
+    # Zero-copy sliding windows; one contiguous copy for Keras
+    X = np.lib.stride_tricks.sliding_window_view(data[:-1, 0], seq_length)[:, :, None]
+    y = data[seq_length:]
+    return np.ascontiguousarray(X), y
 
 SEQ_LENGTH = 50
 X, y = create_sequences(scaled_prices, SEQ_LENGTH)
@@ -29,18 +31,78 @@ X, y = create_sequences(scaled_prices, SEQ_LENGTH)
 X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, shuffle=False)
 
 # Build LSTM model
-model = tf.keras.Sequential([
-    tf.keras.layers.LSTM(50, return_sequences=True, input_shape=(SEQ_LENGTH, 1)),
-    tf.keras.layers.LSTM(50, return_sequences=False),
-    tf.keras.layers.Dense(25),
-    tf.keras.layers.Dense(1)
-])
+def build_model(batch_size=None):
+    return tf.keras.Sequential([
+        tf.keras.Input(shape=(SEQ_LENGTH, 1), batch_size=batch_size),
+        tf.keras.layers.LSTM(50, return_sequences=True),
+        tf.keras.layers.LSTM(50, return_sequences=False),
+        tf.keras.layers.Dense(25),
+        tf.keras.layers.Dense(1),
+        # Keep the output in float32 so the loss stays numerically stable
+        tf.keras.layers.Activation("linear", dtype="float32")
+    ])
+
+model = build_model()
 
-model.compile(optimizer="adam", loss="mean_squared_error")
+model.compile(optimizer="adam", loss="mean_squared_error", jit_compile=True)
 
-# Train model
-model.fit(X_train, y_train, batch_size=64, epochs=20, validation_data=(X_test, y_test))
+# Train model, stopping once validation loss stops improving
+callbacks = [
+    tf.keras.callbacks.EarlyStopping(monitor="val_loss", patience=3, restore_best_weights=True),
+    tf.keras.callbacks.ReduceLROnPlateau(monitor="val_loss", factor=0.5, patience=2, min_lr=1e-5)
+]
+model.fit(X_train, y_train, batch_size=64, epochs=20, validation_data=(X_test, y_test), callbacks=callbacks)
 
 # Save model and scaler
 model.save("models/price_predictor_model.h5")
-joblib.dump(scaler, "models/price_scaler.pkl")
\ No newline at end of file
+# Only the MinMaxScaler bounds are needed at inference time
+np.savez(
+    "models/price_scaler.npz",
+    min=scaler.data_min_,
+    max=scaler.data_max_,
+    rmin=scaler.feature_range[0],
+    rmax=scaler.feature_range[1]
+)
+
+# Export a TFLite model for inference in the bot. The LSTM only converts with a
+# static batch dimension, so copy the weights into a float32 batch-1 model.
+TFLITE_MAX_ERROR = 0.01  # Max mean |TFLite - Keras| on X_test, in scaled units
+
+tf.keras.mixed_precision.set_global_policy("float32")
+export_model = build_model(batch_size=1)
+export_model.set_weights(model.get_weights())
+keras_pred = export_model.predict(X_test, batch_size=1, verbose=0)[:, 0]
+
+def convert_tflite(quantisation):
+    converter = tf.lite.TFLiteConverter.from_keras_model(export_model)
+    if quantisation == "dynamic":
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    elif quantisation == "float16":
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.target_spec.supported_types = [tf.float16]
+    return converter.convert()
+
+def tflite_predict(tflite_model, X):
+    interpreter = tf.lite.Interpreter(model_content=tflite_model)
+    interpreter.allocate_tensors()
+    input_index = interpreter.get_input_details()[0]["index"]
+    output_index = interpreter.get_output_details()[0]["index"]
+    pred = np.empty(len(X), dtype=np.float32)
+    for i in range(len(X)):
+        interpreter.set_tensor(input_index, X[i:i + 1].astype(np.float32))
+        interpreter.invoke()
+        pred[i] = interpreter.get_tensor(output_index)[0, 0]
+    return pred
+
+# Use the smallest quantisation that stays close to the Keras model; float32 always passes.
+# Full INT8 calibration of the batch-1 LSTM crashes the converter, so it is not tried.
+for quantisation in ["dynamic", "float16", "float32"]:
+    tflite_model = convert_tflite(quantisation)
+    error = np.abs(tflite_predict(tflite_model, X_test) - keras_pred).mean()
+    print(f"TFLite {quantisation}: mean abs error {error:.5f}")
+    if error <= TFLITE_MAX_ERROR or quantisation == "float32":
+        break
+
+# Write only after a successful conversion so a failure never clobbers a good model
+with open("models/price_predictor.tflite", "wb") as f:
+    f.write(tflite_model)
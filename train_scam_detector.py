@@ -1,6 +1,6 @@
 import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.linear_model import LogisticRegression
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+from sklearn.linear_model import SGDClassifier
 from sklearn.pipeline import Pipeline
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score
@@ -16,9 +16,11 @@ y = data["is_scam"]  # 1 = scam, 0 = not scam
 X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
 
 # Build and train model
+# HashingVectorizer is stateless, so no vocabulary is held in memory
 model = Pipeline([
-    ("tfidf", TfidfVectorizer()),
-    ("classifier", LogisticRegression())
+    ("hash", HashingVectorizer(n_features=2**18, alternate_sign=False, ngram_range=(1, 2))),
+    ("tfidf", TfidfTransformer()),
+    ("classifier", SGDClassifier(loss="log_loss"))
 ])
 
 model.fit(X_train, y_train)